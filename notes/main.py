@@ -1,6 +1,8 @@
 import os
 import asyncio
-import json
+import bisect
+import hashlib
+import heapq
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -8,14 +10,16 @@ import re
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+import httpx
 import uvicorn
-import pika
+import aio_pika
+import msgpack
+import orjson
 import redis.asyncio as redis
 import asyncpg
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.cluster import MiniBatchKMeans
 import openai
 
 # Configure logging
@@ -38,32 +42,111 @@ app.add_middleware(
 )
 
 # Global variables
-sentence_model: Optional[SentenceTransformer] = None
+sentence_model = None  # SentenceTransformer or OnnxSentenceEncoder
 redis_client: Optional[redis.Redis] = None
 db_pool: Optional[asyncpg.Pool] = None
-rabbitmq_connection: Optional[pika.BlockingConnection] = None
-rabbitmq_channel: Optional[pika.channel.Channel] = None
+rabbitmq_connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+rabbitmq_channel: Optional[aio_pika.abc.AbstractChannel] = None
+openai_client: Optional[openai.AsyncOpenAI] = None
 
 # Configuration
 MODEL_NAME = os.getenv("SENTENCE_MODEL", "all-MiniLM-L6-v2")
+# Directory holding an ONNX export of the sentence model (optional). Produced
+# offline at build time with:
+#   optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 onnx/
+#   quantize_dynamic('onnx/model.onnx', 'onnx/model_int8.onnx', weight_type=QuantType.QInt8)
+SENTENCE_MODEL_ONNX_DIR = os.getenv("SENTENCE_MODEL_ONNX_DIR")
+SENTENCE_MODEL_ONNX_FILE = os.getenv("SENTENCE_MODEL_ONNX_FILE", "model_int8.onnx")
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./talkflow.db")
 RABBITMQ_URL = os.getenv("RABBITMQ_URL", "amqp://localhost:5672")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-# Initialize OpenAI if API key is available
-if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
+class OnnxSentenceEncoder:
+    """SentenceTransformer.encode-compatible wrapper around an ONNX Runtime
+    export of the sentence model (int8-quantized at build time)"""
+
+    def __init__(self, model_dir: str):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        # The export recipe leaves both model.onnx and model_int8.onnx in the
+        # directory; name the quantized file explicitly, since with several
+        # candidates optimum refuses to pick one (and would otherwise load
+        # the FP32 export)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir,
+            file_name=SENTENCE_MODEL_ONNX_FILE,
+            provider="CPUExecutionProvider"
+        )
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, show_progress_bar: bool = False) -> np.ndarray:
+        import torch
+
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            encoded = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=256, return_tensors="pt"
+            )
+            with torch.inference_mode():
+                hidden = self.model(**encoded).last_hidden_state
+                # Mean pooling over non-padding tokens
+                mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+            embeddings.append(pooled.numpy())
+
+        result = np.vstack(embeddings).astype(np.float32)
+        if normalize_embeddings:
+            result /= np.linalg.norm(result, axis=1, keepdims=True) + 1e-12
+        return result
 
 async def initialize_services():
     """Initialize all required services"""
-    global sentence_model, redis_client, db_pool, rabbitmq_connection, rabbitmq_channel
-    
+    global sentence_model, redis_client, db_pool, rabbitmq_connection, rabbitmq_channel, openai_client
+
     try:
-        # Initialize sentence transformer model
-        logger.info(f"Loading sentence transformer model: {MODEL_NAME}")
-        sentence_model = SentenceTransformer(MODEL_NAME)
-        logger.info("✅ Sentence transformer model loaded successfully")
+        # Initialize the OpenAI client once with a pooled HTTP/2 transport so
+        # summaries reuse connections instead of paying a TCP+TLS handshake
+        # per meeting
+        if OPENAI_API_KEY:
+            openai_client = openai.AsyncOpenAI(
+                api_key=OPENAI_API_KEY,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    timeout=30,
+                    limits=httpx.Limits(max_keepalive_connections=20)
+                )
+            )
+            logger.info("✅ OpenAI client initialized")
+
+        # Initialize sentence encoder: prefer the quantized ONNX Runtime export
+        # when one is configured, fall back to the PyTorch model otherwise
+        if SENTENCE_MODEL_ONNX_DIR:
+            try:
+                logger.info(f"Loading ONNX sentence model from: {SENTENCE_MODEL_ONNX_DIR}")
+                sentence_model = OnnxSentenceEncoder(SENTENCE_MODEL_ONNX_DIR)
+                logger.info("✅ ONNX sentence model loaded successfully")
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX sentence model, using PyTorch: {e}")
+
+        if sentence_model is None:
+            # Tune torch threading before the model loads: spread matmuls over
+            # the available cores (leaving one for the event loop) and keep a
+            # single inter-op pool. Without this encode can run single-threaded
+            # inside uvicorn workers.
+            import torch
+            torch.set_num_threads(max(1, (os.cpu_count() or 2) - 1))
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass  # already initialized
+            logger.info(f"Loading sentence transformer model: {MODEL_NAME}")
+            sentence_model = SentenceTransformer(MODEL_NAME)
+            sentence_model.eval()
+            logger.info("✅ Sentence transformer model loaded successfully")
         
         # Initialize Redis
         redis_client = redis.from_url(REDIS_URL)
@@ -77,58 +160,266 @@ async def initialize_services():
         else:
             logger.info("Using SQLite database (PostgreSQL recommended for production)")
         
-        # Initialize RabbitMQ
+        # Initialize RabbitMQ: aio-pika integrates with the event loop, so
+        # queue operations never block the reactor, and reconnects are handled
+        # automatically
         if RABBITMQ_URL:
-            connection_params = pika.URLParameters(RABBITMQ_URL)
-            rabbitmq_connection = pika.BlockingConnection(connection_params)
-            rabbitmq_channel = rabbitmq_connection.channel()
-            
+            rabbitmq_connection = await aio_pika.connect_robust(RABBITMQ_URL)
+            rabbitmq_channel = await rabbitmq_connection.channel()
+
             # Declare queues
-            rabbitmq_channel.queue_declare(queue='transcription_results', durable=True)
-            rabbitmq_channel.queue_declare(queue='notes_processing', durable=True)
-            rabbitmq_channel.queue_declare(queue='export_jobs', durable=True)
-            
+            await rabbitmq_channel.declare_queue('transcription_results', durable=True)
+            await rabbitmq_channel.declare_queue('notes_processing', durable=True)
+            await rabbitmq_channel.declare_queue('export_jobs', durable=True)
+
             logger.info("✅ Connected to RabbitMQ")
         
     except Exception as e:
         logger.error(f"❌ Failed to initialize services: {e}")
         raise
 
-def extract_themes_from_transcripts(transcripts: List[Dict[str, Any]], num_themes: int = 5) -> List[Dict[str, Any]]:
+# Precompiled pattern banks. Compiling once at import time avoids re-parsing
+# the patterns for every transcript segment; the fused alternations let a
+# single pass over the content match all patterns of a category at once.
+IMPORTANT_PATTERNS = [
+    r'\b(?:important|crucial|critical|key|essential|vital|significant)\b',
+    r'\b(?:remember|note|highlight|emphasize|stress)\b',
+    r'\b(?:action|todo|task|follow[- ]?up|next steps?)\b',
+    r'\b(?:decision|decide|agreed?|concluded?)\b',
+    r'\b(?:problem|issue|concern|challenge|risk)\b',
+    r'\b(?:solution|resolve|fix|address)\b',
+    r'\b(?:deadline|due|schedule|timeline)\b',
+    r'\b(?:budget|cost|price|expense)\b'
+]
+
+DECISION_PATTERNS = [
+    r'\b(?:we (?:decided|agreed|concluded|determined))\b',
+    r'\b(?:decision|agreed?|concluded?|determined)\b',
+    r'\b(?:let\'s|we\'ll|we will|we should)\b',
+    r'\b(?:approved|rejected|accepted|denied)\b',
+    r'\b(?:final|finalized|settled|resolved)\b'
+]
+
+ACTION_PATTERNS = [
+    r'\b(?:action|todo|task|assignment)\b',
+    r'\b(?:follow[- ]?up|next steps?)\b',
+    r'\b(?:will|should|need to|have to|must)\b',
+    r'\b(?:by|before|until|deadline)\b',
+    r'\b(?:responsible|assigned|owner)\b'
+]
+
+ASSIGNEE_PATTERNS = [
+    r'\b(\w+) will\b',
+    r'\b(\w+) should\b',
+    r'\bassigned to (\w+)\b',
+    r'\b(\w+) is responsible\b'
+]
+
+DUE_DATE_PATTERNS = [
+    r'\bby (\w+ \d+)\b',
+    r'\bbefore (\w+ \d+)\b',
+    r'\buntil (\w+ \d+)\b',
+    r'\bdeadline (\w+ \d+)\b'
+]
+
+def _fuse_patterns(patterns: List[str]) -> re.Pattern:
+    """Fuse a pattern list into one alternation with a named group per pattern"""
+    return re.compile(
+        "|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)),
+        re.IGNORECASE
+    )
+
+_IMPORTANT_RE = _fuse_patterns(IMPORTANT_PATTERNS)
+_DECISION_RE = _fuse_patterns(DECISION_PATTERNS)
+_ACTION_RE = _fuse_patterns(ACTION_PATTERNS)
+_ASSIGNEE_RES = [re.compile(p, re.IGNORECASE) for p in ASSIGNEE_PATTERNS]
+_DUE_DATE_RES = [re.compile(p, re.IGNORECASE) for p in DUE_DATE_PATTERNS]
+
+# Optional Hyperscan acceleration: compiles each pattern bank into a SIMD-backed
+# DFA that matches all patterns in one linear pass over the transcript
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+def _build_hyperscan_db(patterns: List[str]):
+    """Compile a pattern list into a Hyperscan database"""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.encode() for p in patterns],
+        ids=list(range(len(patterns))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(patterns)
+    )
+    return db
+
+_IMPORTANT_DB = _DECISION_DB = _ACTION_DB = None
+if hyperscan:
+    try:
+        _IMPORTANT_DB = _build_hyperscan_db(IMPORTANT_PATTERNS)
+        _DECISION_DB = _build_hyperscan_db(DECISION_PATTERNS)
+        _ACTION_DB = _build_hyperscan_db(ACTION_PATTERNS)
+        logger.info("✅ Hyperscan pattern databases compiled")
+    except Exception as e:
+        logger.warning(f"Hyperscan unavailable, falling back to re: {e}")
+        _IMPORTANT_DB = _DECISION_DB = _ACTION_DB = None
+
+def _find_offsets(text, sep) -> List[int]:
+    """Return the offsets of every occurrence of sep in text"""
+    offsets = []
+    pos = text.find(sep)
+    while pos != -1:
+        offsets.append(pos)
+        pos = text.find(sep, pos + 1)
+    return offsets
+
+def _scan_patterns(db, fused_re: re.Pattern, content: str) -> List[tuple]:
+    """Scan content against a pattern bank, returning (pattern_id, matched_text) pairs"""
+    if db is not None:
+        data = content.encode('utf-8', 'ignore')
+        found = []
+        # The extractors run in worker threads, and a database's built-in
+        # scratch must not be shared across concurrent scans — allocate one
+        # per call
+        db.scan(
+            data,
+            match_event_handler=lambda pid, start, end, flags, ctx:
+                found.append((pid, data[start:end].decode('utf-8', 'ignore'))),
+            scratch=hyperscan.Scratch(db)
+        )
+        return found
+    return [(int(m.lastgroup[1:]), m.group()) for m in fused_re.finditer(content)]
+
+EMBEDDING_CACHE_TTL = 86400  # 24 hours
+
+def _encode_texts(texts: List[str]) -> np.ndarray:
+    """Encode texts with smart batching: encoding in length order keeps each
+    batch tightly packed so short segments don't pad to the longest one in the
+    meeting, then the results are unsorted back into input order"""
+    import torch
+
+    order = np.argsort([len(t) for t in texts])
+    with torch.inference_mode():
+        sorted_embeddings = sentence_model.encode(
+            [texts[i] for i in order],
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+    embeddings = np.empty_like(sorted_embeddings)
+    embeddings[order] = sorted_embeddings
+    # fp16 halves the memory traffic downstream; safe on unit vectors where
+    # cosine similarity tolerates the reduced mantissa
+    return embeddings.astype(np.float16)
+
+def _embedding_cache_key(text: str) -> str:
+    # f16 marks the stored dtype so stale fp32 entries are never misread
+    return f"emb:{MODEL_NAME}:f16:{hashlib.blake2b(text.encode(), digest_size=16).hexdigest()}"
+
+async def encode_texts_cached(texts: List[str]) -> np.ndarray:
+    """Encode texts, reusing embeddings cached in Redis keyed by content hash.
+
+    Re-processing a meeting (or overlapping segments across meetings) then
+    costs Redis reads instead of transformer forward passes.
+    """
+    if redis_client is None:
+        return await asyncio.to_thread(_encode_texts, texts)
+
+    try:
+        keys = [_embedding_cache_key(t) for t in texts]
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+        cached = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Embedding cache lookup failed: {e}")
+        return await asyncio.to_thread(_encode_texts, texts)
+
+    miss_indices = [i for i, blob in enumerate(cached) if blob is None]
+    if miss_indices:
+        miss_embeddings = await asyncio.to_thread(_encode_texts, [texts[i] for i in miss_indices])
+        dim = miss_embeddings.shape[1]
+    else:
+        miss_embeddings = None
+        dim = len(np.frombuffer(cached[0], dtype=np.float16))
+
+    embeddings = np.empty((len(texts), dim), dtype=np.float16)
+    for i, blob in enumerate(cached):
+        if blob is not None:
+            embeddings[i] = np.frombuffer(blob, dtype=np.float16)
+
+    if miss_indices:
+        embeddings[miss_indices] = miss_embeddings
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for i, emb in zip(miss_indices, miss_embeddings):
+                pipe.setex(keys[i], EMBEDDING_CACHE_TTL, emb.tobytes())
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+    return embeddings
+
+async def extract_themes_from_transcripts(transcripts: List[Dict[str, Any]], num_themes: int = 5) -> List[Dict[str, Any]]:
     """Extract themes from meeting transcripts using clustering"""
     try:
         if not transcripts or len(transcripts) < 2:
             return []
-        
+
         # Extract text content
         texts = [t.get('content', '') for t in transcripts if t.get('content', '').strip()]
         if len(texts) < 2:
             return []
-        
-        # Generate embeddings
-        embeddings = sentence_model.encode(texts)
-        
+
+        # Generate embeddings, hitting the Redis cache first
+        embeddings = await encode_texts_cached(texts)
+
+        # Cluster off the event loop: fit_predict is CPU-bound and would
+        # otherwise stall concurrent requests for the duration of the fit
+        return await asyncio.to_thread(_cluster_themes, texts, embeddings, num_themes)
+
+    except Exception as e:
+        logger.error(f"Error extracting themes: {e}")
+        return []
+
+def _cluster_themes(texts: List[str], embeddings: np.ndarray, num_themes: int) -> List[Dict[str, Any]]:
+    """Cluster embedded transcript texts into themes (blocking, CPU-bound)"""
+    try:
         # Perform clustering
         n_clusters = min(num_themes, len(texts))
         if n_clusters < 2:
             return []
+
+        kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            random_state=42,
+            n_init=3,
+            batch_size=256,
+            max_iter=100
+        )
+        # sklearn needs fp32 for the fit; keep the fp16 matrix for the
+        # centroid-similarity matmuls below
+        cluster_labels = kmeans.fit_predict(embeddings.astype(np.float32))
         
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        cluster_labels = kmeans.fit_predict(embeddings)
-        
-        # Extract themes
+        # Extract themes. Gather cluster members once with fancy indexing
+        # instead of rescanning the full lists for every cluster
         themes = []
-        for cluster_id in range(n_clusters):
-            cluster_texts = [texts[i] for i in range(len(texts)) if cluster_labels[i] == cluster_id]
-            if not cluster_texts:
+        member_indices = [np.where(cluster_labels == c)[0] for c in range(n_clusters)]
+        for cluster_id, idx in enumerate(member_indices):
+            if idx.size == 0:
                 continue
-            
-            # Find most representative text (closest to centroid)
-            cluster_embeddings = [embeddings[i] for i in range(len(embeddings)) if cluster_labels[i] == cluster_id]
-            centroid = np.mean(cluster_embeddings, axis=0)
-            
-            similarities = [cosine_similarity([centroid], [emb])[0][0] for emb in cluster_embeddings]
-            most_representative_idx = np.argmax(similarities)
+            cluster_texts = [texts[i] for i in idx]
+
+            # Find most representative text (closest to centroid). KMeans already
+            # computed the centroids, so reuse them instead of re-averaging; the
+            # embeddings are unit vectors, so cosine similarity reduces to one
+            # matrix-vector product against the renormalized centroid
+            cluster_embeddings = embeddings[idx]
+            centroid = kmeans.cluster_centers_[cluster_id]
+            centroid = (centroid / (np.linalg.norm(centroid) + 1e-12)).astype(np.float16)
+
+            similarities = cluster_embeddings @ centroid
+            most_representative_idx = int(np.argmax(similarities))
             representative_text = cluster_texts[most_representative_idx]
             
             # Generate theme title (first few words or sentence)
@@ -152,44 +443,29 @@ def extract_themes_from_transcripts(transcripts: List[Dict[str, Any]], num_theme
 def extract_important_notes(transcripts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Extract important notes using keyword and pattern matching"""
     try:
-        important_patterns = [
-            r'\b(?:important|crucial|critical|key|essential|vital|significant)\b',
-            r'\b(?:remember|note|highlight|emphasize|stress)\b',
-            r'\b(?:action|todo|task|follow[- ]?up|next steps?)\b',
-            r'\b(?:decision|decide|agreed?|concluded?)\b',
-            r'\b(?:problem|issue|concern|challenge|risk)\b',
-            r'\b(?:solution|resolve|fix|address)\b',
-            r'\b(?:deadline|due|schedule|timeline)\b',
-            r'\b(?:budget|cost|price|expense)\b'
-        ]
-        
         important_notes = []
-        
+
         for transcript in transcripts:
             content = transcript.get('content', '').lower()
             if not content.strip():
                 continue
+
+            # Match all important patterns in a single pass over the content
+            matches = _scan_patterns(_IMPORTANT_DB, _IMPORTANT_RE, content)
+            importance_score = len(matches)
+            matched_patterns = [
+                IMPORTANT_PATTERNS[pid] for pid in sorted({pid for pid, _ in matches})
+            ]
             
-            importance_score = 0
-            matched_patterns = []
-            
-            # Check for important patterns
-            for pattern in important_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                if matches:
-                    importance_score += len(matches)
-                    matched_patterns.append(pattern)
-            
-            # Check for question marks (questions are often important)
-            if '?' in content:
-                importance_score += content.count('?')
-            
-            # Check for exclamation marks (emphasis)
-            if '!' in content:
-                importance_score += content.count('!')
-            
-            # Longer segments might be more important
-            word_count = len(content.split())
+            # Questions are often important, exclamation marks signal emphasis.
+            # count() handles the missing-char case itself, so the extra
+            # membership probes are dropped
+            importance_score += content.count('?')
+            importance_score += content.count('!')
+
+            # Longer segments might be more important; a space count is a
+            # cheap word-count proxy that avoids allocating the split() list
+            word_count = content.count(' ') + 1
             if word_count > 20:
                 importance_score += 1
             
@@ -202,9 +478,9 @@ def extract_important_notes(transcripts: List[Dict[str, Any]]) -> List[Dict[str,
                     'matched_patterns': matched_patterns
                 })
         
-        # Sort by importance score
-        important_notes.sort(key=lambda x: x['importance'], reverse=True)
-        return important_notes[:10]  # Return top 10 important notes
+        # Top 10 by importance score: nlargest is O(N log 10) vs O(N log N)
+        # for a full sort and leaves the list unmutated
+        return heapq.nlargest(10, important_notes, key=lambda x: x['importance'])
         
     except Exception as e:
         logger.error(f"Error extracting important notes: {e}")
@@ -213,46 +489,55 @@ def extract_important_notes(transcripts: List[Dict[str, Any]]) -> List[Dict[str,
 def extract_decisions(transcripts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Extract decisions from meeting transcripts"""
     try:
-        decision_patterns = [
-            r'\b(?:we (?:decided|agreed|concluded|determined))\b',
-            r'\b(?:decision|agreed?|concluded?|determined)\b',
-            r'\b(?:let\'s|we\'ll|we will|we should)\b',
-            r'\b(?:approved|rejected|accepted|denied)\b',
-            r'\b(?:final|finalized|settled|resolved)\b'
-        ]
-        
         decisions = []
-        
+        seen_digests = set()
+
         for transcript in transcripts:
             content = transcript.get('content', '')
             if not content.strip():
                 continue
-            
-            # Check for decision patterns
-            for pattern in decision_patterns:
-                matches = re.finditer(pattern, content, re.IGNORECASE)
-                for match in matches:
-                    # Extract the sentence containing the decision
-                    sentences = content.split('.')
-                    for sentence in sentences:
-                        if match.group() in sentence.lower():
-                            decisions.append({
-                                'title': sentence.strip()[:100] + ('...' if len(sentence) > 100 else ''),
-                                'description': sentence.strip(),
-                                'timestamp': transcript.get('timestamp'),
-                                'decided_by_speaker_id': transcript.get('speaker_id')
-                            })
-                            break
-        
-        # Remove duplicates and return unique decisions
-        unique_decisions = []
-        seen_titles = set()
-        for decision in decisions:
-            if decision['title'] not in seen_titles:
-                unique_decisions.append(decision)
-                seen_titles.add(decision['title'])
-        
-        return unique_decisions[:10]  # Return top 10 decisions
+
+            # Split into sentences once per transcript and map each match to
+            # its containing sentence by bisecting the '.' offsets, instead of
+            # rescanning every sentence for every match
+            if _DECISION_DB is not None:
+                data = content.encode('utf-8', 'ignore')
+                match_offsets = []
+                _DECISION_DB.scan(
+                    data,
+                    match_event_handler=lambda pid, start, end, flags, ctx:
+                        match_offsets.append(start),
+                    scratch=hyperscan.Scratch(_DECISION_DB)
+                )
+                boundaries = _find_offsets(data, b'.')
+                sentences = [s.decode('utf-8', 'ignore') for s in data.split(b'.')]
+            else:
+                match_offsets = [m.start() for m in _DECISION_RE.finditer(content)]
+                boundaries = _find_offsets(content, '.')
+                sentences = content.split('.')
+
+            for start in match_offsets:
+                sentence = sentences[bisect.bisect_right(boundaries, start)].strip()
+                if not sentence:
+                    continue
+
+                # Dedup inline on a short sentence digest: cheaper set members
+                # than full titles, and no post-hoc uniqueness pass
+                digest = hashlib.blake2b(sentence.encode(), digest_size=8).digest()
+                if digest in seen_digests:
+                    continue
+                seen_digests.add(digest)
+
+                decisions.append({
+                    'title': sentence[:100] + ('...' if len(sentence) > 100 else ''),
+                    'description': sentence,
+                    'timestamp': transcript.get('timestamp'),
+                    'decided_by_speaker_id': transcript.get('speaker_id')
+                })
+                if len(decisions) >= 10:  # Top 10 decisions
+                    return decisions
+
+        return decisions
         
     except Exception as e:
         logger.error(f"Error extracting decisions: {e}")
@@ -261,54 +546,29 @@ def extract_decisions(transcripts: List[Dict[str, Any]]) -> List[Dict[str, Any]]
 def extract_action_items(transcripts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Extract action items from meeting transcripts"""
     try:
-        action_patterns = [
-            r'\b(?:action|todo|task|assignment)\b',
-            r'\b(?:follow[- ]?up|next steps?)\b',
-            r'\b(?:will|should|need to|have to|must)\b',
-            r'\b(?:by|before|until|deadline)\b',
-            r'\b(?:responsible|assigned|owner)\b'
-        ]
-        
         action_items = []
-        
+
         for transcript in transcripts:
             content = transcript.get('content', '')
             if not content.strip():
                 continue
-            
-            # Check for action patterns
-            action_score = 0
-            for pattern in action_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    action_score += 1
-            
+
+            # Count distinct action patterns matched in a single pass
+            action_score = len({pid for pid, _ in _scan_patterns(_ACTION_DB, _ACTION_RE, content)})
+
             if action_score >= 2:  # Require multiple action indicators
                 # Try to extract who is responsible
-                assignee_patterns = [
-                    r'\b(\w+) will\b',
-                    r'\b(\w+) should\b',
-                    r'\bassigned to (\w+)\b',
-                    r'\b(\w+) is responsible\b'
-                ]
-                
                 assigned_to = None
-                for pattern in assignee_patterns:
-                    match = re.search(pattern, content, re.IGNORECASE)
+                for pattern in _ASSIGNEE_RES:
+                    match = pattern.search(content)
                     if match:
                         assigned_to = match.group(1)
                         break
-                
+
                 # Try to extract due date
-                due_date_patterns = [
-                    r'\bby (\w+ \d+)\b',
-                    r'\bbefore (\w+ \d+)\b',
-                    r'\buntil (\w+ \d+)\b',
-                    r'\bdeadline (\w+ \d+)\b'
-                ]
-                
                 due_date = None
-                for pattern in due_date_patterns:
-                    match = re.search(pattern, content, re.IGNORECASE)
+                for pattern in _DUE_DATE_RES:
+                    match = pattern.search(content)
                     if match:
                         due_date = match.group(1)
                         break
@@ -329,21 +589,37 @@ def extract_action_items(transcripts: List[Dict[str, Any]]) -> List[Dict[str, An
         logger.error(f"Error extracting action items: {e}")
         return []
 
+# Token budget for the summary prompt's transcript portion
+SUMMARY_MAX_TOKENS = 3000
+SUMMARY_CACHE_TTL = 604800  # 7 days
+
+try:
+    import tiktoken
+    _TIKTOKEN_ENC = tiktoken.encoding_for_model("gpt-3.5-turbo")
+except Exception:
+    _TIKTOKEN_ENC = None
+
 async def generate_summary_with_openai(transcripts: List[Dict[str, Any]], meeting_title: str) -> str:
     """Generate meeting summary using OpenAI GPT"""
     try:
-        if not OPENAI_API_KEY or not transcripts:
+        if openai_client is None or not transcripts:
             return generate_basic_summary(transcripts, meeting_title)
-        
+
         # Combine all transcript content
         full_transcript = "\n".join([
             f"Speaker {t.get('speaker_id', 'Unknown')}: {t.get('content', '')}"
             for t in transcripts if t.get('content', '').strip()
         ])
-        
-        if len(full_transcript) > 8000:  # Limit for API
+
+        # Truncate by tokens rather than characters so the prompt stays inside
+        # the model context without either overflowing or wasting budget
+        if _TIKTOKEN_ENC is not None:
+            token_ids = _TIKTOKEN_ENC.encode(full_transcript)
+            if len(token_ids) > SUMMARY_MAX_TOKENS:
+                full_transcript = _TIKTOKEN_ENC.decode(token_ids[:SUMMARY_MAX_TOKENS]) + "..."
+        elif len(full_transcript) > 8000:  # Limit for API
             full_transcript = full_transcript[:8000] + "..."
-        
+
         prompt = f"""
         Please provide a concise summary of this meeting titled "{meeting_title}".
         
@@ -357,8 +633,16 @@ async def generate_summary_with_openai(transcripts: List[Dict[str, Any]], meetin
         
         Keep the summary professional and concise (2-3 paragraphs).
         """
-        
-        response = await openai.ChatCompletion.acreate(
+
+        # Identical prompts (same transcript + title) produce the same
+        # summary, so cache completions keyed by prompt hash
+        cache_key = f"summary:{hashlib.sha256(prompt.encode()).hexdigest()}"
+        if redis_client is not None:
+            cached = await redis_client.get(cache_key)
+            if cached:
+                return cached.decode()
+
+        response = await openai_client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a professional meeting summarizer. Create clear, concise summaries."},
@@ -367,8 +651,11 @@ async def generate_summary_with_openai(transcripts: List[Dict[str, Any]], meetin
             max_tokens=500,
             temperature=0.3
         )
-        
-        return response.choices[0].message.content.strip()
+
+        summary = response.choices[0].message.content.strip()
+        if redis_client is not None:
+            await redis_client.setex(cache_key, SUMMARY_CACHE_TTL, summary)
+        return summary
         
     except Exception as e:
         logger.error(f"Error generating OpenAI summary: {e}")
@@ -405,16 +692,36 @@ def generate_basic_summary(transcripts: List[Dict[str, Any]], meeting_title: str
 
 async def process_meeting_notes(meeting_id: str) -> Dict[str, Any]:
     """Process meeting transcripts and generate organized notes"""
+    got_lock = False
+    lock_key = f"lock:notes:{meeting_id}"
     try:
-        # Get transcripts from Redis
-        list_key = f"transcripts:{meeting_id}"
-        transcript_keys = await redis_client.lrange(list_key, 0, -1)
-        
-        transcripts = []
-        for key in transcript_keys:
-            transcript_data = await redis_client.get(key)
-            if transcript_data:
-                transcripts.append(json.loads(transcript_data))
+        # Short-circuit if the meeting was already processed
+        notes_key = f"processed_notes:{meeting_id}"
+        cached_notes = await redis_client.get(notes_key)
+        if cached_notes:
+            logger.info(f"Notes already processed for meeting {meeting_id}")
+            return orjson.loads(cached_notes)
+
+        # Take an idempotency lock so concurrent requests for the same
+        # meeting don't run the whole pipeline twice
+        got_lock = await redis_client.set(lock_key, "1", ex=600, nx=True)
+        if not got_lock:
+            logger.info(f"Notes processing already in progress for meeting {meeting_id}")
+            return None
+
+        # Get transcripts from Redis. New meetings store packed msgpack
+        # records in one list, so a single LRANGE loads everything; fall back
+        # to the legacy per-segment-key layout (LRANGE + MGET) for old data
+        packed_key = f"transcripts_packed:{meeting_id}"
+        packed_records = await redis_client.lrange(packed_key, 0, -1)
+        transcripts = [msgpack.unpackb(r, raw=False) for r in packed_records]
+
+        if not transcripts:
+            list_key = f"transcripts:{meeting_id}"
+            transcript_keys = await redis_client.lrange(list_key, 0, -1)
+            if transcript_keys:
+                values = await redis_client.mget(*transcript_keys)
+                transcripts = [orjson.loads(v) for v in values if v]
         
         if not transcripts:
             logger.warning(f"No transcripts found for meeting {meeting_id}")
@@ -422,15 +729,17 @@ async def process_meeting_notes(meeting_id: str) -> Dict[str, Any]:
         
         logger.info(f"Processing {len(transcripts)} transcripts for meeting {meeting_id}")
         
-        # Extract different types of content
-        themes = extract_themes_from_transcripts(transcripts)
-        important_notes = extract_important_notes(transcripts)
-        decisions = extract_decisions(transcripts)
-        action_items = extract_action_items(transcripts)
-        
-        # Generate summary
+        # Extract the independent content types concurrently: the embedding +
+        # clustering branch, the three regex extractors and the OpenAI summary
+        # only share the read-only transcript list
         meeting_title = f"Meeting {meeting_id}"  # In production, get from database
-        summary = await generate_summary_with_openai(transcripts, meeting_title)
+        themes, important_notes, decisions, action_items, summary = await asyncio.gather(
+            extract_themes_from_transcripts(transcripts),
+            asyncio.to_thread(extract_important_notes, transcripts),
+            asyncio.to_thread(extract_decisions, transcripts),
+            asyncio.to_thread(extract_action_items, transcripts),
+            generate_summary_with_openai(transcripts, meeting_title)
+        )
         
         # Prepare notes data
         notes_data = {
@@ -445,15 +754,24 @@ async def process_meeting_notes(meeting_id: str) -> Dict[str, Any]:
         }
         
         # Store processed notes in Redis
-        notes_key = f"processed_notes:{meeting_id}"
-        await redis_client.setex(notes_key, 86400, json.dumps(notes_data))  # 24 hours TTL
-        
+        # orjson emits bytes directly and serializes the numpy floats in themes
+        await redis_client.setex(
+            notes_key, 86400,
+            orjson.dumps(notes_data, option=orjson.OPT_SERIALIZE_NUMPY)
+        )  # 24 hours TTL
+
         logger.info(f"Successfully processed notes for meeting {meeting_id}")
         return notes_data
-        
+
     except Exception as e:
         logger.error(f"Error processing meeting notes: {e}")
         return None
+    finally:
+        if got_lock:
+            try:
+                await redis_client.delete(lock_key)
+            except Exception as e:
+                logger.warning(f"Failed to release notes lock for {meeting_id}: {e}")
 
 @app.on_event("startup")
 async def startup_event():
@@ -468,7 +786,9 @@ async def shutdown_event():
     if db_pool:
         await db_pool.close()
     if rabbitmq_connection:
-        rabbitmq_connection.close()
+        await rabbitmq_connection.close()
+    if openai_client:
+        await openai_client.close()
 
 @app.get("/health")
 async def health_check():
@@ -535,7 +855,7 @@ async def get_processed_notes(meeting_id: str):
         return {
             "success": True,
             "meeting_id": meeting_id,
-            "notes": json.loads(notes_data)
+            "notes": orjson.loads(notes_data)
         }
         
     except Exception as e:
@@ -1,9 +1,12 @@
 import os
+import time
 import asyncio
-import json
+import hashlib
+import orjson
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
 import io
 
@@ -11,10 +14,17 @@ from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import aiofiles
-import pika
+import aio_pika
+import msgpack
 import redis.asyncio as redis
 from faster_whisper import WhisperModel
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:
+    BatchedInferencePipeline = None
 import numpy as np
+import soundfile as sf
+import soxr
 from pydub import AudioSegment
 import webrtcvad
 
@@ -39,13 +49,26 @@ app.add_middleware(
 
 # Global variables
 whisper_model: Optional[WhisperModel] = None
+batched_model = None  # BatchedInferencePipeline when available
 redis_client: Optional[redis.Redis] = None
-rabbitmq_connection: Optional[pika.BlockingConnection] = None
-rabbitmq_channel: Optional[pika.channel.Channel] = None
+rabbitmq_connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+rabbitmq_channel_pool: Optional[aio_pika.pool.Pool] = None
+legacy_fanout_script = None
+
+# Fans the legacy per-key transcript layout out to values server-side, so
+# reading an old meeting costs one round trip instead of LRANGE + N GETs
+_LEGACY_FANOUT_LUA = (
+    "local ks = redis.call('LRANGE', KEYS[1], 0, -1) "
+    "local r = {} "
+    "for i, k in ipairs(ks) do r[i] = redis.call('GET', k) end "
+    "return r"
+)
 
 # Configuration
 MODEL_SIZE = os.getenv("MODEL_SIZE", "base")
 DEVICE = os.getenv("DEVICE", "cpu")
+COMPUTE_TYPE = os.getenv("COMPUTE_TYPE")  # auto-selected when unset
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 RABBITMQ_URL = os.getenv("RABBITMQ_URL", "amqp://localhost:5672")
 
@@ -56,106 +79,236 @@ class TranscriptionJob:
         self.speaker_id = speaker_id
         self.timestamp = timestamp
 
+def select_compute_type(device: str) -> str:
+    """Pick the fastest int8 variant the hardware supports.
+
+    On GPUs int8_float16/int8_bfloat16 keeps the GEMMs on tensor cores; on
+    CPUs plain int8 lets CTranslate2 dispatch VNNI kernels where available.
+    """
+    if COMPUTE_TYPE:
+        return COMPUTE_TYPE
+    try:
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types(device)
+        if device == "cuda":
+            for compute_type in ("int8_float16", "int8_bfloat16", "int8"):
+                if compute_type in supported:
+                    return compute_type
+    except Exception as e:
+        logger.warning(f"Could not probe supported compute types: {e}")
+    return "int8"
+
 async def initialize_services():
     """Initialize all required services"""
-    global whisper_model, redis_client, rabbitmq_connection, rabbitmq_channel
-    
+    global whisper_model, batched_model, redis_client, rabbitmq_connection, rabbitmq_channel_pool, legacy_fanout_script
+
     try:
         # Initialize Whisper model
-        logger.info(f"Loading Whisper model: {MODEL_SIZE}")
-        whisper_model = WhisperModel(MODEL_SIZE, device=DEVICE, compute_type="int8")
+        compute_type = select_compute_type(DEVICE)
+        logger.info(f"Loading Whisper model: {MODEL_SIZE} ({DEVICE}/{compute_type})")
+        whisper_model = WhisperModel(
+            MODEL_SIZE,
+            device=DEVICE,
+            compute_type=compute_type,
+            cpu_threads=os.cpu_count() or 4,
+            num_workers=2
+        )
         logger.info("✅ Whisper model loaded successfully")
-        
-        # Initialize Redis
-        redis_client = redis.from_url(REDIS_URL)
+
+        # Batch the VAD-split segments of each clip through the encoder in
+        # one call instead of decoding them sequentially
+        if BatchedInferencePipeline is not None:
+            batched_model = BatchedInferencePipeline(model=whisper_model)
+            logger.info(f"✅ Batched inference enabled (batch_size={WHISPER_BATCH_SIZE})")
+        
+        # Initialize Redis with a pool sized for concurrent transcribe
+        # requests plus background transcript writes; the default pool of 10
+        # saturates under load
+        redis_client = redis.from_url(
+            REDIS_URL,
+            max_connections=64,
+            socket_keepalive=True,
+            health_check_interval=30
+        )
         await redis_client.ping()
+        legacy_fanout_script = redis_client.register_script(_LEGACY_FANOUT_LUA)
         logger.info("✅ Connected to Redis")
         
-        # Initialize RabbitMQ
+        # Initialize RabbitMQ: a pool of confirm-free channels lets concurrent
+        # transcripts publish in parallel instead of serializing on one channel
         if RABBITMQ_URL:
-            connection_params = pika.URLParameters(RABBITMQ_URL)
-            rabbitmq_connection = pika.BlockingConnection(connection_params)
-            rabbitmq_channel = rabbitmq_connection.channel()
-            
+            rabbitmq_connection = await aio_pika.connect_robust(RABBITMQ_URL)
+
+            async def _new_channel() -> aio_pika.abc.AbstractChannel:
+                return await rabbitmq_connection.channel(publisher_confirms=False)
+
+            rabbitmq_channel_pool = aio_pika.pool.Pool(_new_channel, max_size=8)
+
             # Declare queues
-            rabbitmq_channel.queue_declare(queue='transcription_jobs', durable=True)
-            rabbitmq_channel.queue_declare(queue='transcription_results', durable=True)
-            
+            async with rabbitmq_channel_pool.acquire() as channel:
+                await channel.declare_queue('transcription_jobs', durable=True)
+                await channel.declare_queue('transcription_results', durable=True)
+
             logger.info("✅ Connected to RabbitMQ")
         
     except Exception as e:
         logger.error(f"❌ Failed to initialize services: {e}")
         raise
 
-def preprocess_audio(audio_data: bytes) -> tuple[np.ndarray, int]:
-    """Preprocess audio data for transcription"""
+# Precomputed reciprocal: an in-place multiply is cheaper than a dividing
+# copy, and this path is memory-bound
+_INV_INT16_MAX = np.float32(1.0 / 32767.0)
+
+def preprocess_audio(audio_src) -> tuple[np.ndarray, int]:
+    """Preprocess audio (bytes or a file-like source) for transcription"""
     try:
-        # Load audio using pydub
-        audio = AudioSegment.from_file(io.BytesIO(audio_data))
-        
-        # Convert to mono and resample to 16kHz
-        audio = audio.set_channels(1).set_frame_rate(16000)
-        
-        # Convert to numpy array
-        audio_np = np.array(audio.get_array_of_samples(), dtype=np.float32)
-        audio_np = audio_np / np.iinfo(np.int16).max  # Normalize to [-1, 1]
-        
-        return audio_np, 16000
-        
+        # Accept the upload's spooled file directly so large bodies never
+        # need a monolithic bytes copy in memory
+        if isinstance(audio_src, (bytes, bytearray)):
+            audio_src = io.BytesIO(audio_src)
+
+        # Decode in-process with libsndfile: no ffmpeg subprocess fork per
+        # request, and samples come back already normalized to [-1, 1]
+        try:
+            audio_src.seek(0)
+            audio_np, sample_rate = sf.read(audio_src, dtype='float32', always_2d=True)
+            audio_np = audio_np.mean(axis=1)  # Downmix to mono
+        except Exception:
+            # Compressed containers libsndfile can't parse (mp4/webm) still
+            # go through pydub/ffmpeg
+            audio_src.seek(0)
+            audio = AudioSegment.from_file(audio_src)
+            audio = audio.set_channels(1)
+            sample_rate = audio.frame_rate
+            audio_np = np.array(audio.get_array_of_samples(), dtype=np.float32)
+            np.multiply(audio_np, _INV_INT16_MAX, out=audio_np)  # Normalize to [-1, 1]
+
+        # SIMD-accelerated polyphase resampling to the Whisper sample rate
+        if sample_rate != 16000:
+            audio_np = soxr.resample(audio_np, sample_rate, 16000)
+
+        return np.ascontiguousarray(audio_np, dtype=np.float32), 16000
+
     except Exception as e:
         logger.error(f"Error preprocessing audio: {e}")
         raise HTTPException(status_code=400, detail="Invalid audio format")
 
+# Reusable VAD singleton and int16 scratch buffer (60s at 16 kHz): saves a
+# Vad constructor and an N-byte allocation on every chunk
+_VAD = webrtcvad.Vad(2)  # Aggressiveness level 2
+_SCRATCH_INT16 = np.empty(16000 * 60, dtype=np.int16)
+
 def detect_voice_activity(audio_np: np.ndarray, sample_rate: int) -> bool:
     """Detect if audio contains speech using WebRTC VAD"""
     try:
-        vad = webrtcvad.Vad(2)  # Aggressiveness level 2
-        
-        # Convert to 16-bit PCM
-        audio_int16 = (audio_np * 32767).astype(np.int16)
-        audio_bytes = audio_int16.tobytes()
-        
+        # Convert to 16-bit PCM once, in place in the scratch buffer when the
+        # chunk fits
+        if len(audio_np) <= len(_SCRATCH_INT16):
+            audio_int16 = _SCRATCH_INT16[:len(audio_np)]
+            np.multiply(audio_np, 32767.0, out=audio_int16, casting='unsafe')
+        else:
+            audio_int16 = (audio_np * 32767).astype(np.int16)
+
         # VAD requires specific frame sizes (10, 20, or 30ms)
         frame_duration = 30  # ms
         frame_size = int(sample_rate * frame_duration / 1000)
-        
-        # Check frames for voice activity
+        frame_bytes = frame_size * 2
+        total_frames = len(audio_int16) // frame_size
+        if total_frames == 0:
+            return False
+
+        # Serialize the whole clip once and hand the VAD zero-copy memoryview
+        # slices instead of a numpy slice + tobytes copy per frame
+        buf = memoryview(audio_int16[:total_frames * frame_size].tobytes())
+
         voice_frames = 0
-        total_frames = 0
-        
-        for i in range(0, len(audio_int16) - frame_size, frame_size):
-            frame = audio_int16[i:i + frame_size]
-            if len(frame) == frame_size:
-                is_speech = vad.is_speech(frame.tobytes(), sample_rate)
-                if is_speech:
-                    voice_frames += 1
-                total_frames += 1
-        
+        for i in range(total_frames):
+            if _VAD.is_speech(buf[i * frame_bytes:(i + 1) * frame_bytes], sample_rate):
+                voice_frames += 1
+
         # Return True if more than 30% of frames contain speech
-        return total_frames > 0 and (voice_frames / total_frames) > 0.3
+        return (voice_frames / total_frames) > 0.3
         
     except Exception as e:
         logger.warning(f"VAD detection failed: {e}")
         return True  # Assume speech if VAD fails
 
-async def transcribe_audio(audio_np: np.ndarray, language: str = "en") -> Dict[str, Any]:
-    """Transcribe audio using Faster Whisper"""
-    try:
-        if whisper_model is None:
-            raise HTTPException(status_code=500, detail="Whisper model not initialized")
-        
-        # Transcribe audio
+# Bounded pool for Whisper inference: keeps multi-second transcriptions off
+# the event loop without oversubscribing CTranslate2's own cpu_threads
+_STT_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("STT_WORKERS", "2")))
+
+def _run_transcription(audio_np: np.ndarray, language: str, realtime: bool = False):
+    """Run the blocking transcribe call and drain the segment generator"""
+    # The log-mel features are computed inside CTranslate2 (on the model's
+    # device) from the raw PCM we pass, so there is no seam to feed
+    # precomputed spectrograms; keeping the array contiguous float32 avoids
+    # an internal copy
+    # Short real-time chunks decode greedily: beam-of-5 costs ~5x the
+    # decoder work for a marginal accuracy gain on a few seconds of audio,
+    # while the final batch pass keeps the full beam search
+    beam_size = 1 if realtime else 5
+    if realtime or batched_model is None:
+        # The WebRTC gate already screened this clip, so the sequential path
+        # can skip the internal Silero pass entirely
         segments, info = whisper_model.transcribe(
             audio_np,
             language=language,
-            beam_size=5,
-            best_of=5,
+            beam_size=beam_size,
+            best_of=beam_size,
             temperature=0.0,
             condition_on_previous_text=False,
+            vad_filter=False
+        )
+    else:
+        # The batched pipeline needs VAD chunk boundaries for audio longer
+        # than 30s (it raises without them), and the WebRTC gate only
+        # accepts/rejects whole clips — keep Silero on here
+        segments, info = batched_model.transcribe(
+            audio_np,
+            language=language,
+            batch_size=WHISPER_BATCH_SIZE,
+            beam_size=beam_size,
+            temperature=0.0,
             vad_filter=True,
             vad_parameters=dict(min_silence_duration_ms=500)
         )
-        
+    # The generator decodes lazily, so drain it here in the worker thread.
+    # If the first window already looks silent, stop before decoding the
+    # rest — autoregressive decoding is the bulk of a Whisper call
+    seg_iter = iter(segments)
+    first = next(seg_iter, None)
+    if first is None or (first.no_speech_prob > 0.6 and first.avg_logprob < -1.0):
+        return [], info
+    collected = [first]
+    collected.extend(seg_iter)
+    return collected, info
+
+def _transcript_cache_key(audio_np: np.ndarray, language: str, realtime: bool) -> str:
+    """Key transcripts by a hash of the decoded PCM plus the decode settings"""
+    digest = hashlib.blake2b(audio_np.tobytes(), digest_size=16)
+    digest.update(f"{language}:{int(realtime)}".encode())
+    return f"stt:cache:{digest.hexdigest()}"
+
+async def transcribe_audio(audio_np: np.ndarray, language: str = "en", realtime: bool = False) -> Dict[str, Any]:
+    """Transcribe audio using Faster Whisper"""
+    try:
+        if whisper_model is None:
+            raise HTTPException(status_code=500, detail="Whisper model not initialized")
+
+        # Retried chunks and client reuploads carry identical audio; a cache
+        # hit costs one Redis round trip instead of a full inference
+        cache_key = None
+        if redis_client is not None:
+            cache_key = _transcript_cache_key(audio_np, language, realtime)
+            cached = await redis_client.get(cache_key)
+            if cached:
+                return msgpack.unpackb(cached, raw=False)
+
+        # Transcribe in the worker pool so the event loop stays free
+        segments, info = await asyncio.get_running_loop().run_in_executor(
+            _STT_EXECUTOR, _run_transcription, audio_np, language, realtime
+        )
+
         # Process segments
         transcription_segments = []
         full_text = ""
@@ -171,14 +324,19 @@ async def transcribe_audio(audio_np: np.ndarray, language: str = "en") -> Dict[s
             transcription_segments.append(segment_data)
             full_text += segment.text.strip() + " "
         
-        return {
+        result = {
             "text": full_text.strip(),
             "segments": transcription_segments,
             "language": info.language,
             "language_probability": info.language_probability,
             "duration": info.duration
         }
-        
+
+        if cache_key is not None:
+            await redis_client.setex(cache_key, 86400, msgpack.packb(result))
+
+        return result
+
     except Exception as e:
         logger.error(f"Transcription error: {e}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
@@ -194,26 +352,35 @@ async def store_transcript(meeting_id: str, speaker_id: str, transcript_data: Di
             "timestamp": timestamp,
             "language": transcript_data.get("language", "en"),
             "segments": transcript_data.get("segments", []),
-            "created_at": datetime.utcnow().isoformat()
+            # Integer nanoseconds: one clock read, unambiguous ordering, and
+            # no ISO-string formatting or parsing on the sort path
+            "ts_ns": time.time_ns()
         }
         
-        # Store in Redis with meeting-specific key
-        key = f"transcript:{meeting_id}:{datetime.utcnow().timestamp()}"
-        await redis_client.setex(key, 3600, json.dumps(transcript_record))  # 1 hour TTL
-        
-        # Add to meeting transcript list
-        list_key = f"transcripts:{meeting_id}"
-        await redis_client.lpush(list_key, key)
-        await redis_client.expire(list_key, 3600)
-        
-        # Send to notes processing queue if available
-        if rabbitmq_channel:
-            rabbitmq_channel.basic_publish(
-                exchange='',
-                routing_key='transcription_results',
-                body=json.dumps(transcript_record),
-                properties=pika.BasicProperties(delivery_mode=2)  # Persistent
-            )
+        # Append the packed record to the meeting's transcript list. One
+        # contiguous binary list per meeting replaces the per-segment key plus
+        # key-index layout, so consumers read everything back in a single
+        # LRANGE instead of N GETs
+        packed_record = msgpack.packb(transcript_record)
+        packed_key = f"transcripts_packed:{meeting_id}"
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.rpush(packed_key, packed_record)
+        pipe.expire(packed_key, 3600)  # 1 hour TTL
+        await pipe.execute()
+
+        # Send to notes processing queue if available, reusing the bytes
+        # packed for Redis; msgpack is smaller and cheaper to decode than
+        # JSON for the float-heavy segments list
+        if rabbitmq_channel_pool:
+            async with rabbitmq_channel_pool.acquire() as channel:
+                await channel.default_exchange.publish(
+                    aio_pika.Message(
+                        body=packed_record,
+                        content_type='application/msgpack',
+                        delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+                    ),
+                    routing_key='transcription_results'
+                )
         
         logger.info(f"Stored transcript for meeting {meeting_id}")
         
@@ -230,8 +397,10 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     if redis_client:
         await redis_client.close()
+    if rabbitmq_channel_pool:
+        await rabbitmq_channel_pool.close()
     if rabbitmq_connection:
-        rabbitmq_connection.close()
+        await rabbitmq_connection.close()
 
 @app.get("/health")
 async def health_check():
@@ -249,7 +418,7 @@ async def health_check():
             "services": {
                 "whisper_model": model_status,
                 "redis": "connected",
-                "rabbitmq": "connected" if rabbitmq_channel else "disconnected"
+                "rabbitmq": "connected" if rabbitmq_channel_pool else "disconnected"
             },
             "model_info": {
                 "size": MODEL_SIZE,
@@ -278,13 +447,15 @@ async def transcribe_endpoint(
         if not meeting_id or not speaker_id:
             raise HTTPException(status_code=400, detail="meeting_id and speaker_id are required")
         
-        # Read audio data
-        audio_data = await audio_file.read()
-        if len(audio_data) == 0:
+        # Decode straight from the spooled upload file; Starlette already
+        # spills large bodies to disk, so peak memory stays bounded
+        upload = audio_file.file
+        upload.seek(0, os.SEEK_END)
+        if upload.tell() == 0:
             raise HTTPException(status_code=400, detail="Empty audio file")
-        
+
         # Preprocess audio
-        audio_np, sample_rate = preprocess_audio(audio_data)
+        audio_np, sample_rate = preprocess_audio(upload)
         
         # Check for voice activity
         has_speech = detect_voice_activity(audio_np, sample_rate)
@@ -342,15 +513,25 @@ async def transcribe_realtime(
     try:
         # Read audio data
         audio_data = await audio_file.read()
-        
-        # Store chunk temporarily
-        chunk_key = f"audio_chunk:{meeting_id}:{speaker_id}:{chunk_id}"
-        await redis_client.setex(chunk_key, 300, audio_data)  # 5 minutes TTL
-        
+
         # For real-time, we might want to accumulate chunks before transcribing
         # This is a simplified version that transcribes each chunk
-        
+
         audio_np, sample_rate = preprocess_audio(audio_data)
+
+        # Store the decoded 16 kHz mono PCM rather than the container bytes,
+        # so later reassembly concatenates arrays instead of re-decoding
+        # every chunk through ffmpeg
+        chunk_key = f"audio_chunk:{meeting_id}:{speaker_id}:{chunk_id}"
+        pcm_int16 = (audio_np * 32767.0).astype(np.int16)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(chunk_key, 300, pcm_int16.tobytes())  # 5 minutes TTL
+        pipe.setex(
+            f"{chunk_key}:meta",
+            300,
+            msgpack.packb({"sample_rate": sample_rate, "samples": int(pcm_int16.shape[0])})
+        )
+        await pipe.execute()
         
         # Quick VAD check
         has_speech = detect_voice_activity(audio_np, sample_rate)
@@ -362,8 +543,8 @@ async def transcribe_realtime(
                 "has_speech": False
             }
         
-        # Transcribe chunk
-        transcript_data = await transcribe_audio(audio_np, language)
+        # Transcribe chunk greedily; latency matters more than beam search here
+        transcript_data = await transcribe_audio(audio_np, language, realtime=True)
         
         # Store partial transcript
         timestamp = datetime.utcnow().isoformat()
@@ -393,17 +574,19 @@ async def transcribe_realtime(
 async def get_meeting_transcripts(meeting_id: str):
     """Get all transcripts for a meeting"""
     try:
-        list_key = f"transcripts:{meeting_id}"
-        transcript_keys = await redis_client.lrange(list_key, 0, -1)
-        
-        transcripts = []
-        for key in transcript_keys:
-            transcript_data = await redis_client.get(key)
-            if transcript_data:
-                transcripts.append(json.loads(transcript_data))
-        
-        # Sort by timestamp
-        transcripts.sort(key=lambda x: x.get("timestamp", ""))
+        packed_key = f"transcripts_packed:{meeting_id}"
+        packed_records = await redis_client.lrange(packed_key, 0, -1)
+        transcripts = [msgpack.unpackb(r, raw=False) for r in packed_records]
+
+        if not transcripts:
+            # Legacy layout: resolve the key list to values server-side in a
+            # single EVALSHA round trip
+            values = await legacy_fanout_script(keys=[f"transcripts:{meeting_id}"])
+            transcripts = [orjson.loads(v) for v in values if v]
+
+        # Sort by arrival time; legacy records lack ts_ns and fall back to
+        # their timestamp string
+        transcripts.sort(key=lambda x: (x.get("ts_ns", 0), x.get("timestamp", "")))
         
         return {
             "success": True,
@@ -420,19 +603,21 @@ async def get_meeting_transcripts(meeting_id: str):
 async def delete_meeting_transcripts(meeting_id: str):
     """Delete all transcripts for a meeting"""
     try:
+        packed_key = f"transcripts_packed:{meeting_id}"
+        deleted = await redis_client.llen(packed_key)
+        await redis_client.delete(packed_key)
+
+        # Legacy layout: individual transcript records plus the key index
         list_key = f"transcripts:{meeting_id}"
         transcript_keys = await redis_client.lrange(list_key, 0, -1)
-        
-        # Delete individual transcript records
         if transcript_keys:
             await redis_client.delete(*transcript_keys)
-        
-        # Delete the list
+            deleted += len(transcript_keys)
         await redis_client.delete(list_key)
-        
+
         return {
             "success": True,
-            "message": f"Deleted {len(transcript_keys)} transcripts for meeting {meeting_id}"
+            "message": f"Deleted {deleted} transcripts for meeting {meeting_id}"
         }
         
     except Exception as e:
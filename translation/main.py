@@ -4,29 +4,42 @@ Real-time language interpretation and translation service
 """
 
 import asyncio
+import hashlib
 import json
+from collections import OrderedDict
 import logging
+import orjson
 import os
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
 
 import aioredis
-import pika
+import aio_pika
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import httpx
 from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+from transformers.modeling_outputs import BaseModelOutput
 import torch
-from googletrans import Translator
-import whisper
-import numpy as np
+
+try:
+    import ctranslate2
+except ImportError:  # INT8 inference is optional; fall back to the HF model
+    ctranslate2 = None
+from faster_whisper import WhisperModel
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="MindMeet Translation Service", version="1.0.0")
+app = FastAPI(
+    title="MindMeet Translation Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware
 app.add_middleware(
@@ -40,6 +53,7 @@ app.add_middleware(
 # Global variables
 redis_client = None
 rabbitmq_connection = None
+rabbitmq_channel_pool = None
 translation_models = {}
 supported_languages = {
     'en': 'English',
@@ -117,6 +131,10 @@ supported_languages = {
     'lo': 'Lao'
 }
 
+# Precomputed views of the language table for the request-path guards
+SUPPORTED_CODES = frozenset(supported_languages)
+SUPPORTED_CODE_LIST = list(supported_languages)
+
 # Pydantic models
 class TranslationRequest(BaseModel):
     text: str
@@ -148,68 +166,109 @@ class RealTimeTranslationRequest(BaseModel):
 # Connection manager for WebSocket connections
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Sets keep add/remove O(1); disconnect storms on busy meetings made
+        # the old list scans quadratic
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
         self.meeting_languages: Dict[str, Dict[str, str]] = {}
 
     async def connect(self, websocket: WebSocket, meeting_id: str, user_id: str, target_language: str):
         await websocket.accept()
         if meeting_id not in self.active_connections:
-            self.active_connections[meeting_id] = []
+            self.active_connections[meeting_id] = set()
             self.meeting_languages[meeting_id] = {}
-        
-        self.active_connections[meeting_id].append(websocket)
+
+        self.active_connections[meeting_id].add(websocket)
         self.meeting_languages[meeting_id][user_id] = target_language
-        
+
         logger.info(f"User {user_id} connected to meeting {meeting_id} for {target_language} translation")
 
     def disconnect(self, websocket: WebSocket, meeting_id: str, user_id: str):
-        if meeting_id in self.active_connections:
-            if websocket in self.active_connections[meeting_id]:
-                self.active_connections[meeting_id].remove(websocket)
-            
-            if meeting_id in self.meeting_languages and user_id in self.meeting_languages[meeting_id]:
-                del self.meeting_languages[meeting_id][user_id]
-            
-            # Clean up empty meetings
-            if not self.active_connections[meeting_id]:
-                del self.active_connections[meeting_id]
-                if meeting_id in self.meeting_languages:
-                    del self.meeting_languages[meeting_id]
+        connections = self.active_connections.get(meeting_id)
+        if connections is None:
+            return
+
+        connections.discard(websocket)
+        self.meeting_languages.get(meeting_id, {}).pop(user_id, None)
+
+        # Clean up empty meetings
+        if not connections:
+            self.active_connections.pop(meeting_id, None)
+            self.meeting_languages.pop(meeting_id, None)
 
     async def broadcast_translation(self, meeting_id: str, translation_data: dict):
-        if meeting_id in self.active_connections:
-            disconnected = []
-            for websocket in self.active_connections[meeting_id]:
-                try:
-                    await websocket.send_json(translation_data)
-                except:
-                    disconnected.append(websocket)
-            
-            # Remove disconnected websockets
-            for ws in disconnected:
-                self.active_connections[meeting_id].remove(ws)
+        connections = self.active_connections.get(meeting_id)
+        if not connections:
+            return
+
+        # Serialize once and write every socket concurrently, instead of a
+        # send_json (serialize + sequential await) per listener
+        payload = orjson.dumps(translation_data)
+        snapshot = list(connections)
+        results = await asyncio.gather(
+            *(websocket.send_bytes(payload) for websocket in snapshot),
+            return_exceptions=True
+        )
+
+        # Remove disconnected websockets
+        disconnected = {
+            websocket
+            for websocket, result in zip(snapshot, results)
+            if isinstance(result, Exception)
+        }
+        if disconnected:
+            connections -= disconnected
 
 manager = ConnectionManager()
 
+# datetime.utcnow().isoformat() allocates and formats on every translated
+# message; the date/time prefix only changes once a second, so cache it and
+# append milliseconds from a single clock read
+_iso_second = 0
+_iso_prefix = ''
+
+def iso_now() -> str:
+    """Millisecond ISO-8601 UTC timestamp with a per-second format cache"""
+    global _iso_second, _iso_prefix
+    now_ns = time.time_ns()
+    sec = now_ns // 1_000_000_000
+    if sec != _iso_second:
+        _iso_second = sec
+        _iso_prefix = datetime.fromtimestamp(sec, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    ms = (now_ns // 1_000_000) % 1000
+    return f"{_iso_prefix}.{ms:03d}"
+
 # Initialize services
 async def initialize_services():
     """Initialize Redis, RabbitMQ, and translation models"""
-    global redis_client, rabbitmq_connection
-    
+    global redis_client, rabbitmq_connection, rabbitmq_channel_pool
+
     try:
         # Initialize Redis
         redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379')
         redis_client = await aioredis.from_url(redis_url)
         logger.info("Connected to Redis")
         
-        # Initialize RabbitMQ
+        # Initialize RabbitMQ: the async client keeps AMQP I/O off the event
+        # loop's critical path, and the channel pool lets publishes from
+        # concurrent handlers interleave with GPU-bound translation
         rabbitmq_url = os.getenv('RABBITMQ_URL', 'amqp://localhost:5672')
-        rabbitmq_connection = pika.BlockingConnection(pika.URLParameters(rabbitmq_url))
+        rabbitmq_connection = await aio_pika.connect_robust(rabbitmq_url)
+
+        async def _new_channel():
+            return await rabbitmq_connection.channel(publisher_confirms=False)
+
+        rabbitmq_channel_pool = aio_pika.pool.Pool(_new_channel, max_size=10)
         logger.info("Connected to RabbitMQ")
         
         # Initialize translation models
         await load_translation_models()
-        
+
+        # Start the micro-batcher once the models are ready, holding a
+        # reference so the worker task can't be garbage-collected
+        global _translate_queue
+        _translate_queue = asyncio.Queue()
+        _spawn_background(_translation_batch_worker())
+
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise
@@ -219,20 +278,73 @@ async def load_translation_models():
     global translation_models
     
     try:
-        # Load Google Translator (fallback)
-        translation_models['google'] = Translator()
-        
-        # Load Whisper for speech recognition
-        translation_models['whisper'] = whisper.load_model("base")
+        # Shared async HTTP client for the Google Translate fallback;
+        # googletrans wrapped sync requests and blocked the event loop on
+        # every detect/fallback call
+        translation_models['http'] = httpx.AsyncClient(
+            http2=True,
+            timeout=5.0,
+            limits=httpx.Limits(max_connections=100)
+        )
+
+        # Persistent keep-alive client for the API service; a fresh
+        # AsyncClient per store_translation call paid a TCP handshake and
+        # pool setup for every translated utterance
+        translation_models['api_http'] = httpx.AsyncClient(
+            base_url=os.getenv('API_SERVICE_URL', 'http://localhost:8001'),
+            timeout=2.0,
+            limits=httpx.Limits(max_keepalive_connections=50)
+        )
         
         # Load multilingual models for better accuracy
         device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        if device == "cuda":
+            # TF32 tensor-core matmul for any FP32 fallback paths
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+
+        # Load Whisper for speech recognition through CTranslate2; INT8
+        # kernels cut latency and resident memory versus the FP32 eager
+        # reference implementation
+        translation_models['whisper'] = WhisperModel(
+            "base",
+            device=device,
+            compute_type="int8_float16" if device == "cuda" else "int8"
+        )
         
-        # Load mBART for high-quality translation
+        # Load mBART for high-quality translation. A CTranslate2 INT8
+        # conversion is preferred when present: integer GEMM kernels cut
+        # per-token compute several-fold over FP32. Build it once with:
+        #   ct2-transformers-converter --model facebook/mbart-large-50-many-to-many-mmt \
+        #       --quantization int8 --output_dir $MBART_CT2_DIR
         try:
-            translation_models['mbart_tokenizer'] = AutoTokenizer.from_pretrained("facebook/mbart-large-50-many-to-many-mmt")
-            translation_models['mbart_model'] = AutoModelForSeq2SeqLM.from_pretrained("facebook/mbart-large-50-many-to-many-mmt").to(device)
-            logger.info("Loaded mBART translation model")
+            translation_models['mbart_tokenizer'] = AutoTokenizer.from_pretrained(TRANSLATION_MODEL)
+            translation_models['lang_map'] = _lang_map_for(TRANSLATION_MODEL)
+
+            # Resolve forced-BOS ids once instead of a lang_code_to_id
+            # lookup on every call
+            translation_models['mbart_bos_ids'] = {
+                code: translation_models['mbart_tokenizer'].lang_code_to_id[code]
+                for code in translation_models['lang_map'].values()
+            }
+
+            ct2_dir = os.getenv('MBART_CT2_DIR', '/models/mbart-ct2')
+            if ctranslate2 is not None and os.path.isdir(ct2_dir):
+                translation_models['mbart_ct2'] = ctranslate2.Translator(
+                    ct2_dir,
+                    device=device,
+                    compute_type='int8_float16' if device == 'cuda' else 'int8'
+                )
+                logger.info("Loaded mBART CTranslate2 INT8 model")
+            else:
+                # FP16 on GPU halves the weight/activation bytes moved per
+                # token; the GEMMs here are memory-bandwidth-bound
+                translation_models['mbart_model'] = AutoModelForSeq2SeqLM.from_pretrained(
+                    TRANSLATION_MODEL,
+                    torch_dtype=torch.float16 if device == "cuda" else torch.float32
+                ).to(device).eval()
+                logger.info("Loaded mBART translation model")
         except Exception as e:
             logger.warning(f"Failed to load mBART model: {e}")
         
@@ -242,82 +354,301 @@ async def load_translation_models():
         logger.error(f"Failed to load translation models: {e}")
         raise
 
-def detect_language(text: str) -> Tuple[str, float]:
+GOOGLE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+
+async def detect_language(text: str) -> Tuple[str, float]:
     """Detect language of input text"""
     try:
-        translator = translation_models.get('google')
-        if translator:
-            detection = translator.detect(text)
-            return detection.lang, detection.confidence
-        return 'en', 0.5
+        client = translation_models.get('http')
+        if client is None:
+            return 'en', 0.5
+
+        response = await client.get(
+            GOOGLE_TRANSLATE_URL,
+            params={'client': 'gtx', 'sl': 'auto', 'tl': 'en', 'dt': 't', 'q': text}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        language = data[2] if len(data) > 2 and data[2] else 'en'
+        confidence = float(data[6]) if len(data) > 6 and data[6] else 0.9
+        return language, confidence
     except Exception as e:
         logger.error(f"Language detection failed: {e}")
         return 'en', 0.0
 
-def translate_text_google(text: str, source_lang: str, target_lang: str) -> Tuple[str, float]:
+async def translate_text_google(text: str, source_lang: str, target_lang: str) -> Tuple[str, float]:
     """Translate text using Google Translate"""
     try:
-        translator = translation_models.get('google')
-        if not translator:
+        client = translation_models.get('http')
+        if client is None:
             raise HTTPException(status_code=500, detail="Translation service not available")
-        
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        return result.text, 0.9  # Google Translate typically has high confidence
-        
+
+        response = await client.get(
+            GOOGLE_TRANSLATE_URL,
+            params={'client': 'gtx', 'sl': source_lang, 'tl': target_lang, 'dt': 't', 'q': text}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        translated_text = ''.join(seg[0] for seg in data[0] if seg and seg[0])
+        return translated_text, 0.9  # Google Translate typically has high confidence
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Google translation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
-def translate_text_mbart(text: str, source_lang: str, target_lang: str) -> Tuple[str, float]:
-    """Translate text using mBART model for higher quality"""
-    try:
-        tokenizer = translation_models.get('mbart_tokenizer')
-        model = translation_models.get('mbart_model')
-        
-        if not tokenizer or not model:
-            # Fallback to Google Translate
-            return translate_text_google(text, source_lang, target_lang)
-        
-        # mBART language codes mapping
-        mbart_lang_map = {
-            'en': 'en_XX', 'es': 'es_XX', 'fr': 'fr_XX', 'de': 'de_DE',
-            'it': 'it_IT', 'pt': 'pt_XX', 'ru': 'ru_RU', 'ja': 'ja_XX',
-            'ko': 'ko_KR', 'zh': 'zh_CN', 'ar': 'ar_AR', 'hi': 'hi_IN',
-            'tr': 'tr_TR', 'pl': 'pl_PL', 'nl': 'nl_XX', 'sv': 'sv_SE'
-        }
-        
-        src_lang = mbart_lang_map.get(source_lang, 'en_XX')
-        tgt_lang = mbart_lang_map.get(target_lang, 'en_XX')
-        
-        # Tokenize input
+# The checkpoint is configurable so deployments can swap in a smaller
+# student (e.g. facebook/m2m100_418M or facebook/nllb-200-distilled-600M):
+# for short captions the decoder GEMMs are the whole cost, and fewer
+# parameters means fewer bytes moved per generated token
+TRANSLATION_MODEL = os.getenv('TRANSLATION_MODEL', 'facebook/mbart-large-50-many-to-many-mmt')
+
+# mBART language codes mapping
+mbart_lang_map = {
+    'en': 'en_XX', 'es': 'es_XX', 'fr': 'fr_XX', 'de': 'de_DE',
+    'it': 'it_IT', 'pt': 'pt_XX', 'ru': 'ru_RU', 'ja': 'ja_XX',
+    'ko': 'ko_KR', 'zh': 'zh_CN', 'ar': 'ar_AR', 'hi': 'hi_IN',
+    'tr': 'tr_TR', 'pl': 'pl_PL', 'nl': 'nl_XX', 'sv': 'sv_SE'
+}
+
+# M2M100 uses plain ISO codes; NLLB uses script-qualified codes
+_m2m_lang_map = {code: code for code in mbart_lang_map}
+_nllb_lang_map = {
+    'en': 'eng_Latn', 'es': 'spa_Latn', 'fr': 'fra_Latn', 'de': 'deu_Latn',
+    'it': 'ita_Latn', 'pt': 'por_Latn', 'ru': 'rus_Cyrl', 'ja': 'jpn_Jpan',
+    'ko': 'kor_Hang', 'zh': 'zho_Hans', 'ar': 'arb_Arab', 'hi': 'hin_Deva',
+    'tr': 'tur_Latn', 'pl': 'pol_Latn', 'nl': 'nld_Latn', 'sv': 'swe_Latn'
+}
+
+def _lang_map_for(model_name: str) -> Dict[str, str]:
+    """Pick the language-code table matching the model family"""
+    if 'nllb' in model_name:
+        return _nllb_lang_map
+    if 'm2m100' in model_name:
+        return _m2m_lang_map
+    return mbart_lang_map
+
+def _decode_budget(n_in: int) -> Tuple[int, int]:
+    """Pick beam width and output cap from the input length
+
+    Beam-5 over 512 tokens quintuples decoder FLOPs even for three-word live
+    captions; short inputs decode greedily and the output is capped relative
+    to the input instead of the model maximum.
+    """
+    beams = 1 if n_in <= 16 else (3 if n_in <= 64 else 5)
+    max_new = int(1.5 * n_in + 8)
+    return beams, max_new
+
+# Streaming captions translate the same source text once per target
+# language, and the encoder pass depends only on the source tokens — cache
+# its output so each utterance is encoded once and decoded per target.
+# (Extending a cached prefix with only the new tokens would be unsound: the
+# encoder is bidirectional, so earlier hidden states change as text grows.)
+_encoder_cache: OrderedDict = OrderedDict()
+_ENCODER_CACHE_MAX = 256
+
+def _translate_batch_mbart(texts: List[str], source_lang: str, target_lang: str) -> List[Tuple[str, float]]:
+    """Translate a batch of texts sharing one language pair with mBART"""
+    tokenizer = translation_models.get('mbart_tokenizer')
+    model = translation_models.get('mbart_model')
+    ct2_translator = translation_models.get('mbart_ct2')
+
+    if not tokenizer or (model is None and ct2_translator is None):
+        # Callers fall back to Google Translate on the async path
+        raise RuntimeError("mBART model not available")
+
+    lang_map = translation_models.get('lang_map', mbart_lang_map)
+    src_lang = lang_map.get(source_lang, lang_map['en'])
+    tgt_lang = lang_map.get(target_lang, lang_map['en'])
+
+    # Tokenize input. The src_lang setter rebuilds the tokenizer's special-
+    # token state, so only pay for it when the source language changes;
+    # the batch worker serializes calls, so there is no race here
+    if getattr(tokenizer, 'src_lang', None) != src_lang:
         tokenizer.src_lang = src_lang
-        encoded = tokenizer(text, return_tensors="pt", max_length=512, truncation=True)
-        
-        # Generate translation
-        generated_tokens = model.generate(
-            **encoded,
-            forced_bos_token_id=tokenizer.lang_code_to_id[tgt_lang],
-            max_length=512,
-            num_beams=5,
-            early_stopping=True
+
+    if ct2_translator is not None:
+        # CTranslate2 works on sentencepiece tokens directly
+        pieces = [
+            tokenizer.convert_ids_to_tokens(
+                tokenizer.encode(t, truncation=True, max_length=512)
+            )
+            for t in texts
+        ]
+        n_in = max(len(p) for p in pieces)
+        beams, max_new = _decode_budget(n_in)
+        results = ct2_translator.translate_batch(
+            pieces,
+            target_prefix=[[tgt_lang]] * len(texts),
+            beam_size=beams,
+            max_decoding_length=max_new
         )
-        
-        # Decode result
-        translated_text = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
-        
-        return translated_text, 0.95  # mBART typically has very high quality
-        
+        translations = []
+        for result in results:
+            out_tokens = result.hypotheses[0]
+            if out_tokens and out_tokens[0] == tgt_lang:
+                out_tokens = out_tokens[1:]
+            translated_text = tokenizer.decode(
+                tokenizer.convert_tokens_to_ids(out_tokens),
+                skip_special_tokens=True
+            )
+            translations.append((translated_text, 0.95))
+        return translations
+
+    encoded = tokenizer(texts, return_tensors="pt", padding=True, max_length=512, truncation=True)
+    n_in = encoded['input_ids'].shape[1]
+    beams, max_new = _decode_budget(n_in)
+
+    encoded = {k: v.to(model.device) for k, v in encoded.items()}
+    bos_ids = translation_models.get('mbart_bos_ids', {})
+
+    # Generate translation, reusing a cached encoder pass when the same
+    # utterance was just translated into another target language
+    with torch.inference_mode():
+        gen_kwargs = dict(
+            forced_bos_token_id=bos_ids.get(tgt_lang, tokenizer.lang_code_to_id[tgt_lang]),
+            max_new_tokens=max_new,
+            num_beams=beams,
+            do_sample=False,
+            use_cache=True,
+            early_stopping=beams > 1
+        )
+
+        if len(texts) == 1:
+            enc_key = (src_lang, encoded['input_ids'].cpu().numpy().tobytes())
+            hidden = _encoder_cache.get(enc_key)
+            if hidden is not None:
+                _encoder_cache.move_to_end(enc_key)
+            else:
+                hidden = model.get_encoder()(
+                    input_ids=encoded['input_ids'],
+                    attention_mask=encoded['attention_mask']
+                ).last_hidden_state
+                _encoder_cache[enc_key] = hidden
+                if len(_encoder_cache) > _ENCODER_CACHE_MAX:
+                    _encoder_cache.popitem(last=False)
+            # generate expands encoder_outputs in place for beam search, so
+            # hand it a fresh ModelOutput over a cloned tensor; passing the
+            # cached object directly would corrupt the cache on any beams > 1
+            gen_kwargs['encoder_outputs'] = BaseModelOutput(last_hidden_state=hidden.clone())
+
+        generated_tokens = model.generate(**encoded, **gen_kwargs)
+
+    # Decode result
+    decoded = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+    return [(t, 0.95) for t in decoded]  # mBART typically has very high quality
+
+# Micro-batcher: concurrent translate calls landing within a short window are
+# padded into one mBART batch, so encoder/decoder launch overhead is paid per
+# batch instead of per request
+_translate_queue: Optional[asyncio.Queue] = None
+_TRANSLATE_BATCH_MAX = 16
+_TRANSLATE_BATCH_WINDOW = 0.015  # seconds to wait for more work
+
+async def _translation_batch_worker():
+    """Drain the translate queue into per-language-pair model batches"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _translate_queue.get()]
+        deadline = loop.time() + _TRANSLATE_BATCH_WINDOW
+        while len(batch) < _TRANSLATE_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_translate_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        groups: Dict[Tuple[str, str], list] = {}
+        for item in batch:
+            groups.setdefault((item[1], item[2]), []).append(item)
+
+        for (src, tgt), items in groups.items():
+            texts = [item[0] for item in items]
+            try:
+                results = await asyncio.to_thread(_translate_batch_mbart, texts, src, tgt)
+            except Exception as e:
+                logger.error(f"Batched mBART translation failed: {e}")
+                for _, _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, _, _, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+# Meeting chatter repeats short utterances constantly; a content-addressed
+# cache answers those in one Redis round trip (or a dict lookup for the
+# hottest short phrases) instead of a full beam search
+_local_tx_cache: Dict[str, Tuple[str, float]] = {}
+_LOCAL_TX_CACHE_MAX = 2048
+_LOCAL_TX_TEXT_MAX = 64  # only keep short phrases in process memory
+
+def _translation_cache_key(text: str, source_lang: str, target_lang: str) -> str:
+    digest = hashlib.blake2b(text.strip().lower().encode(), digest_size=16).hexdigest()
+    return f"tx:{source_lang}:{target_lang}:{digest}"
+
+def _remember_local(key: str, text: str, result: Tuple[str, float]):
+    if len(text) > _LOCAL_TX_TEXT_MAX:
+        return
+    if len(_local_tx_cache) >= _LOCAL_TX_CACHE_MAX:
+        _local_tx_cache.pop(next(iter(_local_tx_cache)))
+    _local_tx_cache[key] = result
+
+async def submit_translation(text: str, source_lang: str, target_lang: str) -> Tuple[str, float]:
+    """Queue a translation and wait for its batch to complete"""
+    cache_key = _translation_cache_key(text, source_lang, target_lang)
+    cached = _local_tx_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if redis_client is not None:
+        raw = await redis_client.get(cache_key)
+        if raw:
+            translated_text, confidence = json.loads(raw)
+            result = (translated_text, confidence)
+            _remember_local(cache_key, text, result)
+            return result
+
+    try:
+        if _translate_queue is None:
+            result = (await asyncio.to_thread(_translate_batch_mbart, [text], source_lang, target_lang))[0]
+        else:
+            future = asyncio.get_running_loop().create_future()
+            await _translate_queue.put((text, source_lang, target_lang, future))
+            result = await future
     except Exception as e:
         logger.error(f"mBART translation failed: {e}")
         # Fallback to Google Translate
-        return translate_text_google(text, source_lang, target_lang)
+        result = await translate_text_google(text, source_lang, target_lang)
+
+    _remember_local(cache_key, text, result)
+    if redis_client is not None:
+        try:
+            await redis_client.setex(cache_key, 86400, json.dumps(result))
+        except Exception as e:
+            logger.warning(f"Failed to cache translation: {e}")
+    return result
 
-async def store_translation(meeting_id: str, original_text: str, translated_text: str, 
+# Keep strong references to fire-and-forget tasks; the event loop only
+# holds weak ones, so an unreferenced storage task can be garbage-collected
+# mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+def _spawn_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def store_translation(meeting_id: str, original_text: str, translated_text: str,
                           source_lang: str, target_lang: str, speaker_id: str = None, confidence: float = 0.0):
     """Store translation in database via API service"""
     try:
-        api_url = os.getenv('API_SERVICE_URL', 'http://localhost:8001')
-        
         translation_data = {
             'meeting_id': meeting_id,
             'original_text': original_text,
@@ -326,13 +657,16 @@ async def store_translation(meeting_id: str, original_text: str, translated_text
             'target_language': target_lang,
             'speaker_id': speaker_id,
             'confidence': confidence,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{api_url}/translations", json=translation_data)
-            response.raise_for_status()
-            
+        client = translation_models.get('api_http')
+        if client is None:
+            return
+
+        response = await client.post("/translations", json=translation_data)
+        response.raise_for_status()
+
     except Exception as e:
         logger.error(f"Failed to store translation: {e}")
 
@@ -341,6 +675,17 @@ async def store_translation(meeting_id: str, original_text: str, translated_text
 async def startup_event():
     await initialize_services()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    for client_key in ('http', 'api_http'):
+        client = translation_models.get(client_key)
+        if client is not None:
+            await client.aclose()
+    if rabbitmq_channel_pool is not None:
+        await rabbitmq_channel_pool.close()
+    if rabbitmq_connection is not None:
+        await rabbitmq_connection.close()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "translation"}
@@ -353,7 +698,7 @@ async def get_supported_languages():
 @app.post("/detect-language", response_model=LanguageDetectionResponse)
 async def detect_language_endpoint(request: LanguageDetectionRequest):
     """Detect language of input text"""
-    language, confidence = detect_language(request.text)
+    language, confidence = await detect_language(request.text)
     return LanguageDetectionResponse(language=language, confidence=confidence)
 
 @app.post("/translate", response_model=TranslationResponse)
@@ -361,21 +706,21 @@ async def translate_text_endpoint(request: TranslationRequest):
     """Translate text from source to target language"""
     
     # Validate languages
-    if request.source_language not in supported_languages:
+    if request.source_language not in SUPPORTED_CODES:
         raise HTTPException(status_code=400, detail=f"Unsupported source language: {request.source_language}")
     
-    if request.target_language not in supported_languages:
+    if request.target_language not in SUPPORTED_CODES:
         raise HTTPException(status_code=400, detail=f"Unsupported target language: {request.target_language}")
     
     # Perform translation
-    translated_text, confidence = translate_text_mbart(
-        request.text, 
-        request.source_language, 
+    translated_text, confidence = await submit_translation(
+        request.text,
+        request.source_language,
         request.target_language
     )
     
-    # Store translation
-    await store_translation(
+    # Store translation without holding up the response
+    _spawn_background(store_translation(
         request.meeting_id,
         request.text,
         translated_text,
@@ -383,7 +728,7 @@ async def translate_text_endpoint(request: TranslationRequest):
         request.target_language,
         request.speaker_id,
         confidence
-    )
+    ))
     
     return TranslationResponse(
         original_text=request.text,
@@ -398,34 +743,49 @@ async def translate_text_endpoint(request: TranslationRequest):
 async def websocket_translation_endpoint(websocket: WebSocket, meeting_id: str, user_id: str, target_language: str):
     """WebSocket endpoint for real-time translation"""
     
-    if target_language not in supported_languages:
+    if target_language not in SUPPORTED_CODES:
         await websocket.close(code=4000, reason="Unsupported target language")
         return
     
     await manager.connect(websocket, meeting_id, user_id, target_language)
-    
-    try:
+
+    # Bounded queue between receive and translate: when a speaker outruns
+    # mBART the oldest queued transcript is dropped instead of letting
+    # end-to-end latency climb without bound
+    queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+    async def _reader():
+        while True:
+            message = orjson.loads(await websocket.receive_text())
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Nothing in the message schema marks final transcripts, so
+                # drop the oldest entry outright; newer text supersedes it
+                queue.get_nowait()
+                queue.put_nowait(message)
+
+    async def _translator():
         while True:
-            # Receive transcript data
-            data = await websocket.receive_json()
-            
+            data = await queue.get()
+
             if data.get('type') == 'transcript':
                 original_text = data.get('text', '')
                 source_language = data.get('language', 'en')
                 speaker_id = data.get('speaker_id')
-                
+
                 if original_text and source_language != target_language:
                     # Translate text
-                    translated_text, confidence = translate_text_mbart(
+                    translated_text, confidence = await submit_translation(
                         original_text, source_language, target_language
                     )
-                    
-                    # Store translation
-                    await store_translation(
+
+                    # Store translation without delaying the reply
+                    _spawn_background(store_translation(
                         meeting_id, original_text, translated_text,
                         source_language, target_language, speaker_id, confidence
-                    )
-                    
+                    ))
+
                     # Send translation back to client
                     translation_response = {
                         'type': 'translation',
@@ -435,17 +795,28 @@ async def websocket_translation_endpoint(websocket: WebSocket, meeting_id: str,
                         'target_language': target_language,
                         'speaker_id': speaker_id,
                         'confidence': confidence,
-                        'timestamp': datetime.utcnow().isoformat()
+                        'timestamp': iso_now()
                     }
-                    
-                    await websocket.send_json(translation_response)
-                    
-    except WebSocketDisconnect:
+
+                    await websocket.send_bytes(orjson.dumps(translation_response))
+
+    reader_task = asyncio.create_task(_reader())
+    translator_task = asyncio.create_task(_translator())
+
+    try:
+        done, _ = await asyncio.wait(
+            {reader_task, translator_task},
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                logger.error(f"WebSocket error: {exc}")
+    finally:
+        reader_task.cancel()
+        translator_task.cancel()
         manager.disconnect(websocket, meeting_id, user_id)
         logger.info(f"User {user_id} disconnected from meeting {meeting_id}")
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-        manager.disconnect(websocket, meeting_id, user_id)
 
 @app.post("/meetings/{meeting_id}/enable-translation")
 async def enable_meeting_translation(meeting_id: str, request: RealTimeTranslationRequest):
@@ -456,7 +827,7 @@ async def enable_meeting_translation(meeting_id: str, request: RealTimeTranslati
             'source_language': request.source_language,
             'target_languages': request.target_languages,
             'enabled': True,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         }
         
         await redis_client.setex(
@@ -502,7 +873,7 @@ async def get_translation_stats(meeting_id: str):
             "source_language": settings.get('source_language'),
             "target_languages": settings.get('target_languages'),
             "active_users": active_users,
-            "supported_languages": list(supported_languages.keys())
+            "supported_languages": SUPPORTED_CODE_LIST
         }
         
     except HTTPException:
@@ -513,4 +884,4 @@ async def get_translation_stats(meeting_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    uvicorn.run(app, host="0.0.0.0", port=8003, loop="uvloop", http="httptools")